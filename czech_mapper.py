@@ -1,20 +1,126 @@
 import time
 import threading
 import logging
+import logging.handlers
+import queue
+import atexit
 import os
 import math
+import re
+import heapq
+import itertools
+from collections import defaultdict
 import rtmidi
 from libraries.resolume_http_api import *
+try:
+    import orjson  # optional, faster config parsing
+except ImportError:
+    orjson = None
 
 
-last_press_times = {}  # (channel, note) -> last_time
-press_start_times = {}  # (channel, note) -> time when press started
-hold_threads = {}  # (channel, note) -> Thread
 HOLD_THRESHOLD = 0.75  # seconds
 DEBOUNCE_INTERVAL = 0.2  # seconds
 
+# press/hold bookkeeping runs on integer monotonic nanoseconds so clock adjustments can't wedge it
+_mono = time.monotonic_ns
+_HOLD_NS = int(HOLD_THRESHOLD * 1_000_000_000)
+_DEBOUNCE_NS = int(DEBOUNCE_INTERVAL * 1_000_000_000)
+
+
+# One long-lived worker that fires hold callbacks for every mapping.
+# Note-On arms a deadline, Note-Off cancels it; the worker sleeps on a condition
+# until the earliest deadline instead of spawning a thread per press.
+class HoldScheduler:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []  # (fire_at_ns, seq, generation, mapping, midi_out)
+        self._seq = 0
+        self._thread = None
+        self._running = True
+
+    def _push(self, fire_at, mapping, midi_out):
+        entry = (fire_at, self._seq, mapping._hold_gen, mapping, midi_out)
+        heapq.heappush(self._heap, entry)
+        self._seq += 1
+        return entry
+
+    # Python's Condition.notify() must be called with the lock held, so the contention
+    # saving comes from notifying less: arm() only wakes the worker when the new deadline
+    # becomes the head of the heap, and cancel() never wakes it (the stale entry is
+    # dropped when its deadline comes up).
+    def arm(self, mapping, delay_ns, midi_out):
+        with self._cond:
+            if not self._running:
+                return  # stopped for shutdown; holds no longer fire
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hold-scheduler", daemon=True)
+                self._thread.start()
+            mapping._hold_gen += 1
+            entry = self._push(_mono() + delay_ns, mapping, midi_out)
+            if self._heap[0] is entry:
+                self._cond.notify()
+
+    def cancel(self, mapping):
+        # Bumping the generation marks any queued entry for this mapping as stale
+        with self._cond:
+            mapping._hold_gen += 1
+
+    # Shutdown holds the lock across notify_all() so the worker can't miss the signal
+    # between checking _running and going back to sleep. Stopping is final: later arm()
+    # calls are ignored rather than starting a worker that would exit straight away.
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._heap.clear()
+            self._cond.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due = []
+                while not due:
+                    if not self._running:
+                        return
+                    # drop cancelled entries from the head
+                    while self._heap and self._heap[0][2] != self._heap[0][3]._hold_gen:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    timeout_ns = self._heap[0][0] - _mono()
+                    if timeout_ns > 0:
+                        self._cond.wait(timeout_ns / 1e9)
+                        continue
+                    now = _mono()
+                    while self._heap and self._heap[0][0] <= now:
+                        fire_at, _, gen, mapping, midi_out = heapq.heappop(self._heap)
+                        if gen != mapping._hold_gen:
+                            continue
+                        due.append((gen, mapping, midi_out))
+                        if mapping.hold_repeat_interval:
+                            self._push(fire_at + int(mapping.hold_repeat_interval * 1_000_000_000), mapping, midi_out)
+            for gen, mapping, midi_out in due:
+                if gen == mapping._hold_gen:
+                    # one failing callback must not take down hold handling for every mapping
+                    try:
+                        mapping._fire_hold(midi_out)
+                    except Exception:
+                        logging.exception(f"Hold callback for mapping '{mapping.name}' failed")
+
+
+hold_scheduler = HoldScheduler()
+
 # An individual mapping of actions to do when a specific midi note or controller is pressed
 class MidiMapping:
+    __slots__ = (
+        "name", "type", "channel", "note", "controller", "toggle", "callback", "easing", "state",
+        "hold_callback", "hold_repeat_interval", "hold_triggered",
+        "_last_press", "_press_start", "_hold_gen", "_note_on_status", "_note_off_status", "handle",
+    )
+
     def __init__(self, name, type="note", channel=None, note=None, controller=None, toggle=False, callback=None, easing=None, hold_callback=None, hold_repeat_interval=None):
         self.name = name
         self.type = type  # note or cc
@@ -28,6 +134,21 @@ class MidiMapping:
         self.hold_callback = hold_callback
         self.hold_repeat_interval = hold_repeat_interval
         self.hold_triggered = False
+        # per-mapping press state (this mapping already owns its channel+note)
+        self._last_press = 0
+        self._press_start = None
+        self._hold_gen = 0  # bumped on every arm/cancel so stale holds never fire
+        # full status bytes for this mapping's channel, compared directly instead of masking
+        # (only for int channels; anything else is left to MappingRouter.register to reject)
+        valid_channel = isinstance(channel, int)
+        self._note_on_status = 0x90 | channel if valid_channel else None
+        self._note_off_status = 0x80 | channel if valid_channel else None
+        if type == 'note':
+            self.handle = self._handle_note
+        elif type == 'cc':
+            self.handle = self._handle_cc
+        else:
+            self.handle = self._handle_none
 
     def matches(self, message):
         status, data1, _ = message
@@ -41,70 +162,140 @@ class MidiMapping:
             return self.controller == data1
         return False
 
-    def _start_hold_thread(self, key, midi_out):
-        def hold_loop():
-            time.sleep(HOLD_THRESHOLD)
-            if key not in press_start_times:
+    def _fire_hold(self, midi_out):
+        if self._press_start is None:
+            return
+        self.hold_triggered = True
+        if self.hold_callback:
+            self.hold_callback(True, midi_out, self.channel)
+
+    # handle is bound to one of these in __init__ so the per-event path skips the type checks
+    def _handle_note(self, message, midi_out):
+        status, _, value = message
+        if status == self._note_on_status and value > 0:  # Note ON
+            now = _mono()
+            if now - self._last_press < _DEBOUNCE_NS:
                 return
-            self.hold_triggered = True
-            if self.hold_callback:
-                self.hold_callback(True, midi_out, self.channel)
-            if self.hold_repeat_interval:
-                while key in press_start_times:
-                    time.sleep(self.hold_repeat_interval)
-                    self.hold_callback(True, midi_out, self.channel)
-        thread = threading.Thread(target=hold_loop, daemon=True)
-        hold_threads[key] = thread
-        thread.start()
-
-    def handle(self, message, midi_out):
-        status, data1, value = message
+            self._last_press = now
+            self._press_start = now
+            self.hold_triggered = False
+            hold_scheduler.arm(self, _HOLD_NS, midi_out)
+
+        elif status == self._note_off_status or status == self._note_on_status:  # Note OFF (or Note ON with velocity 0)
+            start_time = self._press_start
+            self._press_start = None
+            hold_scheduler.cancel(self)
+            if start_time is not None:
+                if self.hold_triggered:
+                    return  # Already handled by hold logic
+                callback = self.callback
+                if self.toggle:
+                    self.state = not self.state
+                    if callback:
+                        callback(self.state, midi_out, self.channel)
+                elif callback:
+                    callback(False, midi_out, self.channel)
+
+    def _handle_cc(self, message, midi_out):
+        status, _, value = message
+        callback = self.callback
+        if callback and status & 0xF0 == 0xB0:
+            callback(value, midi_out, self.channel, self.easing)
+
+    def _handle_none(self, message, midi_out):
+        pass
+
+
+# Routes incoming MIDI messages to their mapping with a single table index
+# Tables are dense 16 x 128 lists indexed by (channel << 7) | data1
+class MappingRouter:
+    def __init__(self, mappings=()):
+        self._note_table = [None] * (16 * 128)  # (channel << 7) | note -> MidiMapping
+        self._cc_table = [None] * (16 * 128)  # (channel << 7) | controller -> MidiMapping
+        for mapping in mappings:
+            self.register(mapping)
+
+    def register(self, mapping):
+        if mapping.channel is None:
+            logging.warning(f"Mapping '{mapping.name}' has no channel and will never match")
+            return
+        if mapping.type == "note":
+            table, field, data1 = self._note_table, "note", mapping.note
+        elif mapping.type == "cc":
+            table, field, data1 = self._cc_table, "controller", mapping.controller
+        else:
+            return
+        # out-of-range entries are skipped rather than aborting the whole action map
+        if not isinstance(mapping.channel, int) or not 0 <= mapping.channel <= 0x0F:
+            logging.warning(f"Mapping '{mapping.name}' has channel {mapping.channel!r} outside 0-15 and will never match")
+            return
+        if not isinstance(data1, int) or not 0 <= data1 <= 0x7F:
+            logging.warning(f"Mapping '{mapping.name}' has {field} {data1!r} outside 0-127 and will never match")
+            return
+        slot = (mapping.channel << 7) | data1
+        existing = table[slot]
+        if existing is not None:
+            logging.warning(
+                f"Mapping '{mapping.name}' replaces '{existing.name}' on channel {mapping.channel} {field} {data1}; "
+                "only one mapping per message is dispatched"
+            )
+        table[slot] = mapping
+
+    def mappings(self):
+        return [m for m in self._note_table if m] + [m for m in self._cc_table if m]
+
+    def lookup(self, status, data1):
+        if data1 > 0x7F:
+            return None
         msg_type = status & 0xF0
-        key = (self.channel, self.note)
-
-        if self.type == 'note':
-            if msg_type == 0x90 and value > 0:  # Note ON
-                now = time.time()
-                last_time = last_press_times.get(key, 0)
-                if now - last_time < DEBOUNCE_INTERVAL:
-                    return
-                last_press_times[key] = now
-                press_start_times[key] = now
-                self.hold_triggered = False
-                self._start_hold_thread(key, midi_out)
-
-            elif msg_type == 0x80 or (msg_type == 0x90 and value == 0):  # Note OFF
-                start_time = press_start_times.pop(key, None)
-                if key in hold_threads:
-                    hold_threads.pop(key, None)
-                if start_time:
-                    held_duration = time.time() - start_time
-                    if self.hold_triggered:
-                        return  # Already handled by hold logic
-                    if self.toggle:
-                        self.state = not self.state
-                        if self.callback:
-                            self.callback(self.state, midi_out, self.channel)
-                    elif self.callback:
-                        self.callback(False, midi_out, self.channel)
+        if msg_type == 0x90 or msg_type == 0x80:  # Note On/Off
+            return self._note_table[((status & 0x0F) << 7) | data1]
+        if msg_type == 0xB0:  # Control Change
+            return self._cc_table[((status & 0x0F) << 7) | data1]
+        return None
+
+    def dispatch(self, message, midi_out):
+        mapping = self.lookup(message[0], message[1])
+        if mapping:
+            mapping.handle(message, midi_out)
+        return mapping
 
-        elif self.type == 'cc' and msg_type == 0xB0:
-            if self.callback:
-                self.callback(value, midi_out, self.channel, self.easing)
+
+# === Config Files ===
+def load_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r") as f:
+        return json.load(f)
 
 
 # === Logging ===
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_FMT = logging.Formatter(LOG_FORMAT)
+_log_listener = None
+_root_logger = logging.getLogger()
+
 def setup_logging(log_level, resolume_host, resolume_osc_port, resolume_http_port):
+    global _log_listener
     log_dir = "log"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    logging.basicConfig(level=log_level, format='%(asctime)s - %(levelname)s - %(message)s')
+    os.makedirs(log_dir, exist_ok=True)
+    root = logging.getLogger()
+    root.setLevel(log_level)
+    if _log_listener is None:  # don't stack handlers on repeated calls
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(_FMT)
+        log_file_name = os.path.join(log_dir, f"midi_log_{time.strftime('%Y%m%d_%H%M%S')}.log")
+        file_handler = logging.FileHandler(log_file_name, encoding="utf-8")
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(_FMT)
+        # MIDI threads only enqueue records; a background listener does the console and disk writes
+        log_queue = queue.SimpleQueue()
+        root.handlers = [logging.handlers.QueueHandler(log_queue)]
+        _log_listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
     logger = logging.getLogger(__name__)
-    log_file_name = os.path.join(log_dir, f"midi_log_{time.strftime('%Y%m%d_%H%M%S')}.log")
-    file_handler = logging.FileHandler(log_file_name, encoding="utf-8")
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(file_handler)
     logger.info("🚀 Starting MIDI Mapper")
     logger.info(f"Resolume Host: {resolume_host}, OSC Port: {resolume_osc_port}, HTTP Port: {resolume_http_port}")
 
@@ -112,25 +303,24 @@ def setup_logging(log_level, resolume_host, resolume_osc_port, resolume_http_por
 # === Resolume Info ===
 def get_channel_group_mapping(resolume_host, resolume_http_port,name_to_channel):
     channel_group_mapping = {}
-    group_list = {}
+    group_list = defaultdict(list)
     layer_list = process_composition(resolume_host, resolume_http_port)
+    ntc_get = name_to_channel.get
 
     for layer in layer_list:
         group_name = layer["group"]
-        group_index = layer["group_index"]
-        channel = name_to_channel.get(group_name)
+        channel = ntc_get(group_name)
 
         if channel is not None:
             channel_group_mapping[channel] = {
                 "group_name": group_name,
-                "group_index": group_index
+                "group_index": layer["group_index"]
             }
 
-        if group_name not in group_list:
-            group_list[group_name] = []
         group_list[group_name].append(layer)
 
-    return channel_group_mapping, layer_list, group_list
+    return channel_group_mapping, layer_list, dict(group_list)
+
 
 
 
@@ -140,10 +330,19 @@ def get_channel_group_mapping(resolume_host, resolume_http_port,name_to_channel)
 
 
 
+FILL_LED_COUNT = 5  # clip-launch rows used as the fill meter
 
 # A class to manage the state of each channel
 # This class will handle the MIDI state for each channel, including the group and layer information
 class ControllerState:
+    STATE_KEYS = ("playing", "color", "effect", "transform", "fill")
+    _ALLOWED = frozenset(STATE_KEYS)
+    __slots__ = (
+        "midi_out", "channel_group_mapping", "layer_list", "channel", "group_name", "group_index",
+        "playing", "color", "effect", "transform", "fill",
+        "all_fill_layers", "total_fill_layers", "_fill_layer_ids", "_max_fill_bucket", "_last_led_frame", "_frames", "_state_dirty",
+    )
+
     def __init__(self, channel,channel_group_mapping, layer_list, midi_out):
         self.midi_out = midi_out
         self.channel_group_mapping = channel_group_mapping
@@ -151,20 +350,25 @@ class ControllerState:
         self.channel = channel
         self.group_name = channel_group_mapping.get(channel, {}).get("group_name", "Unknown")
         self.group_index = channel_group_mapping.get(channel, {}).get("group_index", 0)
-        self.state = {
-            "playing": False,
-            "color": False,
-            "effect": False,
-            "transform": False,
-            "fill": 0.0,
-        }
+        # state flags are plain slot attributes so each update is a single store
+        self.playing = False
+        self.color = False
+        self.effect = False
+        self.transform = False
+        self.fill = 0.0
         self.all_fill_layers = [layer for layer in layer_list if layer["group_index"] == self.group_index and layer["layer_type"] == "Fill Layer"]
         self.total_fill_layers = len(self.all_fill_layers)
+        self._fill_layer_ids = tuple(layer["layer_index"] for layer in self.all_fill_layers)
+        self._max_fill_bucket = min(self.total_fill_layers, FILL_LED_COUNT)  # highest fill bucket with a frame
+        self._last_led_frame = None
+        self._frames = self._build_frames()
+        self._state_dirty = True
 
     def update(self, key, value):
-        if key in self.state:
-            logging.debug(f"Updating state for channel {self.channel}, key {key} to {value}")
-            self.state[key] = value
+        if key in self._ALLOWED:
+            logging.debug("Updating state for channel %s, key %s to %s", self.channel, key, value)
+            setattr(self, key, value)
+            self._state_dirty = True
         else:
             logging.warning(f"Unknown channel {self.channel} in state update")
 
@@ -173,55 +377,74 @@ class ControllerState:
             "channel": self.channel,
             "group_name": self.group_name,
             "group_index": self.group_index,
-            "state": self.state
+            "state": {key: getattr(self, key) for key in self.STATE_KEYS}
         }
-    def set_leds(self, targets):
-        for target in targets:
-            channel = target["channel"]
-            note = target["note"]
-            value = target.get("value", 127)
-            self.midi_out.send_message([0x90 + channel, note, value])
-    def update_loop(self):
-        logging.debug(f"Updating LEDs for channel {self.channel} ({self.group_name})")
-        if self.state["playing"]: 
-            self.set_leds([{"channel": self.channel, "note": 60, "value": 127}])   # Set activator LED to Green
-            self.set_leds([{"channel": self.channel, "note": 52, "value": 2}])     # Set stop clip LED to Blinking Green
-        else:
-            self.set_leds([{"channel": self.channel, "note": 60, "value": 0}])     # set activator LED to Off
-            self.set_leds([{"channel": self.channel, "note": 52, "value": 0}])     # set stop clip LED to Off  
 
-        if self.state["color"]: self.set_leds([{"channel": self.channel, "note": 61, "value": 127}])
-        else: self.set_leds([{"channel": self.channel, "note": 61, "value": 0}])
+    # Every LED frame this channel can show, indexed by _frame_index(). A frame is a tuple of
+    # ready-to-send 3-byte messages; identical messages share one bytes object so update_loop
+    # can diff frames by identity and never allocates a message.
+    def _build_frames(self):
+        status = 0x90 + self.channel
+        fill_buckets = self._max_fill_bucket + 1
+        messages = {}
+        frames = [None] * (fill_buckets << 4)
+        for playing, color, effect, transform in itertools.product((False, True), repeat=4):
+            transform_color = 5  if transform      else  1
+            for fill_layer_int in range(fill_buckets):
+                frame = bytearray((
+                    status, 60, 127 if playing else 0,          # activator LED Green / Off
+                    status, 52, 2 if playing else 0,            # stop clip LED Blinking Green / Off
+                    status, 61, 127 if color else 0,
+                    status, 62, 127 if effect else 0,
+                ))
+                for i in range(FILL_LED_COUNT):                  # fill LEDs, notes 57 down to 53
+                    frame += bytes((status, 57 - i, transform_color if playing and i < fill_layer_int else 0))
+                frames[self._frame_index(playing, color, effect, transform, fill_layer_int)] = tuple(
+                    messages.setdefault(bytes(frame[i:i + 3]), bytes(frame[i:i + 3])) for i in range(0, len(frame), 3)
+                )
+        return frames
+
+    # state flags packed into one int: fill bucket in the high bits, one bit per toggle below it
+    @staticmethod
+    def _frame_index(playing, color, effect, transform, fill_layer_int):
+        return (fill_layer_int << 4) | (bool(playing) << 3) | (bool(color) << 2) | (bool(effect) << 1) | bool(transform)
 
-        if self.state["effect"]: self.set_leds([{"channel": self.channel, "note": 62, "value": 127}])
-        else: self.set_leds([{"channel": self.channel, "note": 62, "value": 0}])
+    def update_loop(self):
+        if not self._state_dirty:
+            return  # nothing changed since the last refresh
+        self._state_dirty = False
+        logging.debug("Updating LEDs for channel %s (%s)", self.channel, self.group_name)
+        # clamp to the buckets _build_frames made so out-of-range fill values can't miss or wrap the table
+        fill_layer_int = min(max(int(self.fill * self.total_fill_layers), 0), self._max_fill_bucket)
+        frame = self._frames[self._frame_index(self.playing, self.color, self.effect, self.transform, fill_layer_int)]
+
+        last = self._last_led_frame
+        self._last_led_frame = frame
+        send = self.midi_out.send_message
+        if last is None:
+            for message in frame:
+                send(message)
+            return
+        # only send the LEDs whose value changed since the last frame
+        for message, previous in zip(frame, last):
+            if message is not previous:
+                send(message)
 
-        transform_color = 5  if self.state["transform"]      else  1
-        fill_layer_int = int(self.state["fill"] * self.total_fill_layers)
-        for i in range(fill_layer_int):
-            if self.state["playing"]:
-                self.set_leds([{"channel": self.channel, "note": 57 - i, "value": transform_color}])
-            else:
-                self.set_leds([{"channel": self.channel, "note": 57 - i, "value": 0}])
-        for j in range(5- fill_layer_int):
-            self.set_leds([{"channel": self.channel, "note": 57 - fill_layer_int - j, "value": 0}])
+    def invalidate(self):
+        self._last_led_frame = None
+        self._state_dirty = True
 
     def pick_fill_layers(self):
-        fill_layers_int = math.ceil(self.state["fill"] * self.total_fill_layers)
-
-        fill_layer_ids = [ layer["layer_index"] for layer in self.layer_list if layer["group_index"] == self.group_index and layer["layer_type"] == "Fill Layer"]
+        fill_layers_int = math.ceil(self.fill * self.total_fill_layers)
+        fill_layers = self._fill_layer_ids[:fill_layers_int]
         if fill_layers_int == 0:
-            fill_layers = []
             logging.info(f"Channel {self.channel} ({self.group_name}) - No fill layers selected")
-        elif fill_layers_int >= len(fill_layer_ids):
-            fill_layers = fill_layer_ids
+        elif fill_layers_int >= self.total_fill_layers:
             logging.info(f"Channel {self.channel} ({self.group_name}) - All fill layers selected")
         else:
-            fill_layers = fill_layer_ids[:fill_layers_int]
-            logging.info(f"Channel {self.channel} ({self.group_name}) - Selected {fill_layers_int} fill layers: {fill_layers}") 
+            logging.info(f"Channel {self.channel} ({self.group_name}) - Selected {fill_layers_int} fill layers: {fill_layers}")
 
-        
-        return fill_layers
+        return list(fill_layers)
 
 class LayoutMap:
     def __init__(self, layout_file, rotation=0):
@@ -230,7 +453,8 @@ class LayoutMap:
         if rotation not in [0, 90, 180, 270]:
             raise ValueError("Rotation must be one of: 0, 90, 180, 270 degrees")
         self.rotate_layout()
-        
+        self.build_grid()
+        self.build_location_index()
 
     def rotate_layout(self):
         if self.rotation == 90:
@@ -241,8 +465,32 @@ class LayoutMap:
             self.layout_map = {(-y, x): v for (x, y), v in self.layout_map.items()}
 
     def load_layout(self, layout_file):
-        with open(layout_file, 'r') as f:
-            return json.load(f)
+        data = load_json(layout_file)
+        return {(entry["x"], entry["y"]): entry for entry in data["layout_map"]}
+
+    # Dense grid of (note, status) indexed by (x - xmin, y - ymin) for the rotated layout
+    def build_grid(self):
+        if not self.layout_map:
+            self._xmin = self._ymin = 0
+            self._grid = []
+            return
+        xs = [x for x, _ in self.layout_map]
+        ys = [y for _, y in self.layout_map]
+        self._xmin, self._ymin = min(xs), min(ys)
+        width, height = max(xs) - self._xmin + 1, max(ys) - self._ymin + 1
+        self._grid = [[None] * height for _ in range(width)]
+        for (x, y), entry in self.layout_map.items():
+            self._grid[x - self._xmin][y - self._ymin] = (entry["note"], entry["status"])
+
+    # Flat (channel << 7 | note) -> (x, y) table so reverse lookups are a single list index
+    def build_location_index(self):
+        self._xy = [None] * (16 * 128)
+        for xy, entry in self.layout_map.items():
+            if entry["status"] & 0xF0 == 0x90:
+                self._xy[((entry["status"] & 0x0F) << 7) | entry["note"]] = xy
+
+    def get_location(self, channel, note):
+        return self._xy[(channel << 7) | note]
 
     def get_entry(self, x, y):
         return self.layout_map.get((x, y))
@@ -251,12 +499,26 @@ class LayoutMap:
         return self.layout_map.values()
 
     def get_note_channel_status_by_xy(self, x, y):
-        entry = self.get_entry(x, y)
-        if entry:
-            return entry["note"], entry["status"]
+        i, j = x - self._xmin, y - self._ymin
+        if 0 <= i < len(self._grid):
+            column = self._grid[i]
+            if 0 <= j < len(column) and column[j] is not None:
+                return column[j]
         return None, None
 
     
+# Index of the first port whose name contains keyword (case-insensitive).
+# keyword may also be a list of alternative names, matched with one precompiled regex.
+def find_port_index(ports, keyword):
+    if isinstance(keyword, str):
+        needle = keyword.lower()
+        return next((i for i, name in enumerate(ports) if needle in name.lower()), None)
+    pattern = re.compile("|".join(map(re.escape, keyword)), re.I)
+    return next((i for i, name in enumerate(ports) if pattern.search(name)), None)
+
+
+MAX_LED_NOTES = 128  # preallocated LED triplets per controller frame
+
 class MidiController:
     status_map = {
         144: "Note",
@@ -274,32 +536,38 @@ class MidiController:
 
         self.midi_in = rtmidi.MidiIn()
         self.midi_out = rtmidi.MidiOut()
+        self.port_names = {}  # port_type -> name of the port we opened
+        self._listening = False
+        self._watch_stop = threading.Event()
         self.open_ports()
         self.ports = []
+        # LED output is shared by rtmidi's input thread and the hold scheduler, so the frame
+        # buffer, cursor and reused message are guarded by _led_lock
+        self._led_lock = threading.Lock()
+        self._led_buf = bytearray(3 * MAX_LED_NOTES)  # reused for every LED frame
+        self._led_len = 0
+        self._msg = [0, 0, 0]  # reused for every LED send; rtmidi copies it before returning
 
     def open_ports(self):
         self.open_named_port(self.midi_in, self.controller_name, "input")
         self.open_named_port(self.midi_out, self.controller_name, "output")
 
     def open_named_port(self, midi, keyword, port_type):
-        name_match = keyword.lower()
-        logging.info(f"Opening {port_type} port containing: '{name_match}'")
+        logging.info(f"Opening {port_type} port containing: '{keyword}'")
         available_ports = midi.get_ports()
-        for i, port in enumerate(available_ports):
-            if name_match in port.lower():
-                logging.info(f"Opening {port_type} port: {port}")
-                midi.open_port(i)
-                return
-        logging.error(f"No matching {port_type} ports found with keyword '{name_match}'")
-        raise Exception(f"No matching {port_type} ports found with keyword '{name_match}'")
+        i = find_port_index(available_ports, keyword)
+        if i is not None:
+            logging.info(f"Opening {port_type} port: {available_ports[i]}")
+            midi.open_port(i)
+            self.port_names[port_type] = available_ports[i]
+            return
+        logging.error(f"No matching {port_type} ports found with keyword '{keyword}'")
+        raise Exception(f"No matching {port_type} ports found with keyword '{keyword}'")
 
     def load_action_map(self, path):
-        with open(path, "r") as f:
-            data = json.load(f)
-
-        note_map = {}
-        cc_map = {}
+        data = load_json(path)
 
+        router = MappingRouter()
         for entry in data:
             mapping = MidiMapping(
                 name=entry["name"],
@@ -313,24 +581,89 @@ class MidiController:
                 hold_callback=self.callback_registry.get(entry.get("hold_callback")),
                 hold_repeat_interval=entry.get("hold_repeat_interval")
             )
-
-            if mapping.type == "note":
-                note_map[(mapping.channel, mapping.note)] = mapping
-            elif mapping.type == "cc":
-                cc_map[(mapping.channel, mapping.controller)] = mapping
-
-        self.note_map = note_map
-        self.cc_map = cc_map
-        return list(note_map.values()) + list(cc_map.values())  # Optional: full list if needed
-
-
-    def set_leds(self, targets):
-        for target in targets:
-            channel = target["channel"]
-            note = target["note"]
-            value = target.get("value", 127)
-            self.midi_out.send_message([0x90 + channel, note, value])
-
+            router.register(mapping)
+
+        self.router = router
+        return router.mappings()  # Optional: full list if needed
+
+
+    # Queue LED note-ons into one frame buffer; pass flush=False to keep collecting
+    def set_leds(self, targets, flush=True):
+        with self._led_lock:
+            buf = self._led_buf
+            n = self._led_len
+            for target in targets:
+                if n + 3 > len(buf):
+                    buf.extend(bytes(len(buf)))  # rare: grow past MAX_LED_NOTES
+                buf[n] = 0x90 + target["channel"]
+                buf[n + 1] = target["note"]
+                buf[n + 2] = target.get("value", 127)
+                n += 3
+            self._led_len = n
+            if flush:
+                self._flush_leds_locked()
+
+    def flush_leds(self):
+        with self._led_lock:
+            self._flush_leds_locked()
+
+    def _flush_leds_locked(self):
+        n = self._led_len
+        if not n:
+            return
+        # every queued LED is sent: callbacks may also write to midi_out directly, so a
+        # repeated frame can still be a needed correction
+        buf = self._led_buf
+        send = self.midi_out.send_message  # rtmidi only accepts one channel message per call
+        msg = self._msg
+        for i in range(0, n, 3):
+            msg[0], msg[1], msg[2] = buf[i], buf[i + 1], buf[i + 2]
+            send(msg)
+        self._led_len = 0
+
+    # Have rtmidi's input thread push each message to us instead of polling get_message()
+    def listen(self):
+        self._listening = True
+        self.midi_in.set_callback(self._on_midi_message)
+
+    # Poll the port lists off the MIDI path and reopen a port if the device was unplugged and comes back
+    def watch_ports(self, interval=1.0):
+        def watch():
+            disconnected = set()  # port types whose device has disappeared since we opened it
+            while not self._watch_stop.wait(interval):
+                for midi, port_type in ((self.midi_in, "input"), (self.midi_out, "output")):
+                    # a half-enumerated or busy device can make rtmidi raise mid-replug; log it and
+                    # retry on the next poll rather than letting the watcher thread die
+                    try:
+                        self._check_port(midi, port_type, disconnected)
+                    except Exception:
+                        logging.exception(f"Error while checking {port_type} port for {self.controller_name}")
+        threading.Thread(target=watch, name=f"{self.controller_name} port watcher", daemon=True).start()
+
+    def _check_port(self, midi, port_type, disconnected):
+        ports = midi.get_ports()
+        if port_type not in disconnected:
+            if self.port_names.get(port_type) in ports:
+                return
+            logging.warning(f"Lost {port_type} port: {self.port_names.get(port_type)}")
+            disconnected.add(port_type)
+        # a replug usually comes back under the same name, so match on the keyword again
+        i = find_port_index(ports, self.controller_name)
+        if i is None:
+            return  # still unplugged
+        logging.warning(f"Reconnecting {port_type} port: {ports[i]}")
+        midi.close_port()
+        midi.open_port(i)
+        self.port_names[port_type] = ports[i]
+        disconnected.discard(port_type)
+        if midi is self.midi_in and self._listening:
+            midi.set_callback(self._on_midi_message)
+
+    def stop_watching_ports(self):
+        self._watch_stop.set()
+
+    def _on_midi_message(self, message, data=None):
+        self.handle_midi_message(message)
 
     def handle_midi_message(self, message):
         values, delta_time = message
@@ -339,25 +672,13 @@ class MidiController:
             return
 
         status, data1, value = values
-        msg_type = status & 0xF0
-        channel = status & 0x0F
-
-        mapping = None
-        if msg_type in (0x90, 0x80):  # Note On/Off
-            mapping = self.note_map.get((channel, data1))
-        elif msg_type == 0xB0:  # Control Change
-            mapping = self.cc_map.get((channel, data1))
-
-        if mapping:
-            mapping.handle((status, data1, value), self.midi_out)
-        else:
-            logging.debug(f"No mapping for channel {channel}, msg_type {hex(msg_type)}, data1 {data1}")
+        if not self.router.dispatch((status, data1, value), self.midi_out) and _root_logger.isEnabledFor(logging.DEBUG):
+            logging.debug("No mapping for channel %s, msg_type %s, data1 %s", status & 0x0F, hex(status & 0xF0), data1)
 
     
 
 def load_controllers(config_file="controllers_config.json", callback_registry=None):
-    with open(config_file, "r") as f:
-        controller_configs = json.load(f)
+    controller_configs = load_json(config_file)
 
     controllers = []
     for config in controller_configs:
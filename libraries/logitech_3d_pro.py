@@ -1,11 +1,13 @@
 import math
 
 # === Envelope Functions ===
+_HALF_PI = math.pi / 2
+
 def linear(x): return x
-def sine_in(x): return 1 - math.cos((x * math.pi) / 2)
-def sine_out(x): return math.sin((x * math.pi) / 2)
-def expo_in(x): return x ** 2
-def expo_out(x): return 1 - (1 - x) ** 2
+def sine_in(x): return 1 - math.cos(x * _HALF_PI)
+def sine_out(x): return math.sin(x * _HALF_PI)
+def expo_in(x): return x * x
+def expo_out(x): return x * (2 - x)
 
 envelopes = {
     "linear": linear,
@@ -18,34 +20,66 @@ envelopes = {
 
 
 class JoystickInput:
-    
+    __slots__ = ("joystick", "num_axes", "deadzone", "envelopes", "state", "_envelope_fns", "_span", "_instance_id")
+
     def __init__(self, joystick):
         self.joystick = joystick
         self.num_axes = joystick.get_numaxes()
         self.deadzone = [0.05] * self.num_axes
         self.envelopes = ["linear"] * self.num_axes
         self.state = [0.0] * self.num_axes
+        # pygame 2 tags joystick events with instance_id; pygame 1 only has the device index
+        if hasattr(joystick, "get_instance_id"):
+            self._instance_id = joystick.get_instance_id()
+        else:
+            self._instance_id = joystick.get_id()
+        # resolved per axis when configured so shaping does no name lookups
+        self._envelope_fns = [linear] * self.num_axes
+        self._span = [1 - dz for dz in self.deadzone]
 
     def set_deadzone(self, axis, value):
         self.deadzone[axis] = value
+        self._span[axis] = 1 - value
 
     def set_envelope(self, axis, envelope_name):
         if envelope_name in envelopes:
             self.envelopes[axis] = envelope_name
+            self._envelope_fns[axis] = envelopes[envelope_name]
 
     def process_axis(self, axis_index):
-        raw = self.joystick.get_axis(axis_index)
+        return self.shape_axis(axis_index, self.joystick.get_axis(axis_index))
+
+    # Apply deadzone and envelope to a raw axis reading
+    def shape_axis(self, axis_index, raw):
+        magnitude = abs(raw)
         dz = self.deadzone[axis_index]
-        if abs(raw) < dz:
+        if magnitude < dz:
             return 0.0
-        norm = (abs(raw) - dz) / (1 - dz)
-        norm = max(0.0, min(norm, 1.0))
-        transformed = envelopes[self.envelopes[axis_index]](norm)
-        return math.copysign(transformed, raw)
+        norm = (magnitude - dz) / self._span[axis_index]
+        if norm > 1.0:
+            norm = 1.0
+        return math.copysign(self._envelope_fns[axis_index](norm), raw)
 
     def update_and_send_osc(self, osc_sender):
+        changed = []
+        get_axis = self.joystick.get_axis
+        shape = self.shape_axis
+        state = self.state
         for i in range(self.num_axes):
-            new_val = self.process_axis(i)
-            if abs(new_val - self.state[i]) > 0.01:
-                osc_sender.send_axis(i, new_val)
-                self.state[i] = new_val
+            new_val = shape(i, get_axis(i))
+            if abs(new_val - state[i]) > 0.01:
+                changed.append((i, new_val))
+                state[i] = new_val
+        if changed:
+            osc_sender.send_axes(changed)  # one bundle for every axis that moved this tick
+
+    # Event-driven alternative to polling: a caller's pygame event loop can pass JOYAXISMOTION
+    # events here so only the moved axis is processed. Events from other sticks are ignored.
+    def handle_axis_motion(self, event, osc_sender):
+        if getattr(event, "instance_id", getattr(event, "joy", None)) != self._instance_id:
+            return
+        axis_index = event.axis
+        new_val = self.shape_axis(axis_index, event.value)
+        if abs(new_val - self.state[axis_index]) > 0.01:
+            self.state[axis_index] = new_val
+            osc_sender.send_axis(axis_index, new_val)
@@ -2,18 +2,34 @@ import requests
 import json
 import pandas as pd
 import logging
+import re
+from functools import lru_cache
 
 
 
+# One keep-alive session for all composition fetches, plus the last ETag'd response per url
+_session = requests.Session()
+_composition_cache = {}  # url -> (etag, data)
+_last_processed = (None, None)  # (composition data, processed rows) from the previous process_composition
+
 def fetch_composition(resolume_host, resolume_port):
     url = f"http://{resolume_host}:{resolume_port}/api/v1/composition"
     print(f"Fetching composition from {url}")
     try:
         headers = {"Content-Type": "application/json"}
-        
-        response = requests.get(url, headers=headers, timeout=2)
+        cached = _composition_cache.get(url)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        response = _session.get(url, headers=headers, timeout=2)
+        if response.status_code == 304 and cached:
+            return cached[1]
         if response.status_code == 200:
-            return response.json()
+            data = response.json()
+            etag = response.headers.get("ETag")
+            if etag:
+                _composition_cache[url] = (etag, data)
+            return data
         else:
             print(f"⚠️ Failed to fetch composition: {response.status_code}")
             print("Please check if Resolume is running and the API is accessible.")
@@ -48,26 +64,27 @@ def extract_groups(data):
             })
     return groups
 
+# keyword -> (layer type, emoji), in the order they are reported
+_LAYER_TYPES = {
+    "fills": ("Fill Layer", "🔴"),
+    "effects": ("Effects Layer", "🟣"),
+    "colors": ("Color Layer", "🟡"),
+    "transforms": ("Transform Layer", "🟢"),
+}
+_LAYER_TYPE_RE = re.compile("|".join(_LAYER_TYPES))
+
+# Layer names repeat on every composition poll, so classify each distinct name once
+@lru_cache(maxsize=4096)
 def classify_layer(name):
-    lname_lower = name.lower()
-    layer_type = []
-    emoji = []
-    if "fills" in lname_lower:
-        layer_type.append("Fill Layer")
-        emoji.append("🔴")
-    if "effects" in lname_lower:
-        layer_type.append("Effects Layer")
-        emoji.append("🟣")
-    if "colors" in lname_lower:
-        layer_type.append("Color Layer")
-        emoji.append("🟡")
-    if "transforms" in lname_lower:
-        layer_type.append("Transform Layer")
-        emoji.append("🟢")
-    return ", ".join(layer_type), " ".join(emoji)
+    found = set(_LAYER_TYPE_RE.findall(name.lower()))
+    matches = [types for keyword, types in _LAYER_TYPES.items() if keyword in found]
+    return ", ".join(t for t, _ in matches), " ".join(e for _, e in matches)
 
 def process_composition(resolume_host, resolume_port):
+    global _last_processed
     data = fetch_composition(resolume_host, resolume_port)
+    if data is not None and data is _last_processed[0]:
+        return list(_last_processed[1])  # 304 Not Modified: nothing to re-extract or re-classify
     groups = extract_groups(data)
 
     processed_data = []
@@ -82,5 +99,6 @@ def process_composition(resolume_host, resolume_port):
             "layer_type": layer_type,
             "emoji": emoji
         })
-    
-    return processed_data
\ No newline at end of file
+
+    _last_processed = (data, processed_data)
+    return list(processed_data)
\ No newline at end of file
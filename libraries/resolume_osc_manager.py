@@ -1,29 +1,183 @@
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
 from pythonosc.udp_client import SimpleUDPClient
+from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+# One bundle is one UDP datagram, which can't exceed 64 KiB, so a buffer this size always holds it
+OSC_SNDBUF_MIN = 64 * 1024
 
 
 class ResolumeOSCManager:
-    def __init__(self, host="127.0.0.1", send_port=7000, receive_port=7001):
+    def __init__(self, host="127.0.0.1", send_port=7000, receive_port=7001, flush_interval=None):
         self.host = host
         self.send_port = send_port
         self.receive_port = receive_port
-        self.sender = OSCSender(ip=host, port=send_port)
+        self.sender = OSCSender(ip=host, port=send_port, flush_interval=flush_interval)
         # self.receiver = OSCReceiver(ip=host, port=port)
 
 
 class OSCSender:
-    def __init__(self, ip="127.0.0.1", port=7000):
+    # flush_interval: seconds to hold sends and coalesce them into one bundle (None sends right away)
+    def __init__(self, ip="127.0.0.1", port=7000, flush_interval=None):
         self.ip = ip
         self.port = port
         self.client = SimpleUDPClient(ip, port)
+        # SimpleUDPClient keeps one socket for its lifetime (a private attribute, so look it up
+        # defensively); only raise its send buffer, never shrink a larger OS default
+        sock = getattr(self.client, "_sock", None)
+        if sock is not None and sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) < OSC_SNDBUF_MIN:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, OSC_SNDBUF_MIN)
+        self.flush_interval = flush_interval
+        # one long-lived flusher thread waits on _cond for the end of each flush window
+        self._cond = threading.Condition()
+        self._pending = []
+        self._latest = {}  # address -> value for continuous controls; a newer value replaces a queued one
+        self._batch_depth = 0
+        self._deadline = None  # monotonic time the current flush window closes, None when idle
+        self._flusher = None
+        self._running = True
+        # address strings are built once per id and reused on every send
+        self._axis_paths = {}
+        self._button_paths = {}
+        # built messages for on/off (int 0/1) sends, which repeat constantly
+        self._status_messages = {}
+
+    # Build an OscMessage, reusing the cached one for int 0/1 values
+    def _message(self, address, value):
+        if type(value) is int and (value == 0 or value == 1):
+            msg = self._status_messages.get((address, value))
+            if msg is None:
+                msg = self._status_messages[(address, value)] = self._build_message(address, value)
+            return msg
+        return self._build_message(address, value)
+
+    @staticmethod
+    def _build_message(address, value):
+        msg = OscMessageBuilder(address=address)
+        for arg in (value if isinstance(value, (list, tuple)) else (value,)):
+            msg.add_arg(arg)
+        return msg.build()
+
+    # latest=True marks a continuous value (axis position) where only the newest queued one matters
+    def _send(self, address, value, latest=False):
+        if not self._batch_depth and not self.flush_interval:
+            self.client.send(self._message(address, value))
+            return
+        with self._cond:
+            if latest:
+                self._latest[address] = value
+            else:
+                self._pending.append((address, value))
+            if not self._batch_depth and self._deadline is None and self._running:
+                self._deadline = time.monotonic() + self.flush_interval
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._run_flusher, name="osc-flusher", daemon=True)
+                    self._flusher.start()
+                self._cond.notify()
+
+    def _run_flusher(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    # batch() flushes on exit, so only a window opened outside a batch is ours
+                    if self._deadline is None or self._batch_depth:
+                        self._cond.wait()
+                        continue
+                    timeout = self._deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                messages = self._take_pending()
+            # a failed send (e.g. network unreachable) drops this window but keeps the flusher running
+            try:
+                self._send_messages(messages)
+            except Exception:
+                logging.exception(f"Failed to send {len(messages)} OSC message(s) to {self.ip}:{self.port}")
+
+    # Collect every send inside the block and flush them as one bundle on exit
+    @contextmanager
+    def batch(self):
+        with self._cond:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._cond:
+                self._batch_depth -= 1
+                done = not self._batch_depth
+            if done:
+                self.flush_now()
+
+    # Send anything pending immediately (e.g. timing-critical pulses)
+    def flush_now(self):
+        with self._cond:
+            messages = self._take_pending()
+        self._send_messages(messages)
+
+    # Flush what's queued and stop the flusher thread; later sends go out immediately
+    def close(self):
+        with self._cond:
+            self._running = False
+            self.flush_interval = None
+            self._cond.notify_all()
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        self.flush_now()
+
+    # Caller holds _cond
+    def _take_pending(self):
+        messages, self._pending = self._pending, []
+        if self._latest:
+            messages.extend(self._latest.items())
+            self._latest = {}
+        self._deadline = None
+        return messages
+
+    def _send_messages(self, messages):
+        if len(messages) == 1:
+            self.client.send(self._message(*messages[0]))
+        elif messages:
+            self.send_bundle(messages)
+
+    # Pack several (address, value) pairs into one bundle so they go out in a single datagram
+    def send_bundle(self, messages):
+        bundle = OscBundleBuilder(IMMEDIATELY)
+        for address, value in messages:
+            bundle.add_content(self._message(address, value))
+        self.client.send(bundle.build())
+
+    def _axis_path(self, axis_id):
+        path = self._axis_paths.get(axis_id)
+        if path is None:
+            path = self._axis_paths[axis_id] = f"/czechb/joystick/axis/{axis_id}"
+        return path
+
+    def _button_path(self, button_id):
+        path = self._button_paths.get(button_id)
+        if path is None:
+            path = self._button_paths[button_id] = f"/czechb/joystick/button/{button_id}"
+        return path
 
     def send_axis(self, axis_id, value):
-        self.client.send_message(f"/czechb/joystick/axis/{axis_id}", value)
+        self._send(self._axis_path(axis_id), value, latest=True)
+
+    def send_axes(self, axes):
+        with self.batch():
+            for axis_id, value in axes:
+                self.send_axis(axis_id, value)
 
     def send_button(self, button_id, pressed):
-        self.client.send_message(f"/czechb/joystick/button/{button_id}", int(pressed))
+        self._send(self._button_path(button_id), int(pressed))
 
     def send_hat(self, x, y):
-        self.client.send_message("/czechb/joystick/hat", [x, y])
+        self._send("/czechb/joystick/hat", [x, y])
 
 class OSCReceiver:
     def __init__(self, ip="127.0.0.1", port=7001):
@@ -39,21 +39,18 @@ from czech_mapper import *
 setup_logging(LOG_LEVEL,RESOLUME_HOST,RESOLUME_OSC_PORT,RESOLUME_HTTP_PORT)
 
 controllers = load_controllers("controller_configs/launchpad_and_apc.json")
-
-
-    
+for controller in controllers:
+    controller.listen()  # messages are dispatched from rtmidi's input thread as they arrive
+    controller.watch_ports()  # reopen the ports if the controller is unplugged and reconnected
 
 
 while True:
     try: 
-        for controller in controllers:
-            # listen for midi messages
-            midi_in = controller.midi_in
-            midi_out = controller.midi_out
-            msg = midi_in.get_message()
-            if msg:
-                controller.handle_midi_message(msg)
-        time.sleep(0.01)  # Sleep to prevent busy-waiting
+        time.sleep(1)
     except KeyboardInterrupt:
         print("Exiting...")
-        break
\ No newline at end of file
+        break
+
+for controller in controllers:
+    controller.stop_watching_ports()
+hold_scheduler.stop()
@@ -13,6 +13,7 @@ RESOLUME_HOST = "192.168.4.71"
 RESOLUME_HTTP_PORT = 8080
 RESOLUME_OSC_PORT = 7000
 MIDI_CONTROLLER_NAME = "APC"
+MAX_MESSAGES_PER_TICK = 64
 
 NAME_TO_CHANNEL = {
     "FFT": 0,
@@ -57,7 +58,7 @@ def stop_clip_callback(state, midi_out, channel):
 
 def transform_button_callback(state, midi_out, channel):
     channel_name = channel_group_mapping.get(channel, {}).get("group_name", "Unknown")
-    state = not current_state[channel].state["transform"]
+    state = not current_state[channel].transform
     logging.info(f"Transform button {'pressed' if state else 'released'} on channel {channel_name} ID {channel}")
     current_state[channel].update("transform", state)
 
@@ -135,7 +136,8 @@ for channel, group in channel_group_mapping.items():
         #     hold_callback=mapping.get("hold_callback", None),
         #     hold_repeat_interval=mapping.get("hold_repeat_interval", None)
         # ))
-        
+
+router = MappingRouter(midi_mappings)
 
 current_state = {
     channel: ControllerState(channel, channel_group_mapping=channel_group_mapping, layer_list=layer_list, midi_out=midi_out) for channel in NAME_TO_CHANNEL.values()
@@ -148,33 +150,42 @@ for channel in current_state:
 logging.info("🎛️ Starting MIDI event loop")
 try:
     while True:
-        msg = midi_in.get_message()
-        if msg:
+        # drain everything rtmidi has queued (bounded per tick) instead of one message per sleep
+        touched_channels = set()
+        handled = 0
+        while handled < MAX_MESSAGES_PER_TICK:
+            msg = midi_in.get_message()
+            if not msg:
+                break
+            handled += 1
             message, delta = msg
             status, data1, data2 = message
             msg_type = status & 0xF0
             channel = status & 0x0F
 
             if msg_type == 0x90:
-                logging.debug(f"🎹 NOTE ON: Note {data1} | Velocity {data2} | Channel {channel}")
+                logging.debug("🎹 NOTE ON: Note %s | Velocity %s | Channel %s", data1, data2, channel)
             elif msg_type == 0x80:
-                logging.debug(f"🔈 NOTE OFF: Note {data1} | Channel {channel}")
+                logging.debug("🔈 NOTE OFF: Note %s | Channel %s", data1, channel)
             elif msg_type == 0xB0:
-                logging.debug(f"🎛 CC: Controller {data1} | Value {data2} | Channel {channel}")
+                logging.debug("🎛 CC: Controller %s | Value %s | Channel %s", data1, data2, channel)
             else:
-                logging.debug(f"🎲 Unknown MIDI Message: {message}")
+                logging.debug("🎲 Unknown MIDI Message: %s", message)
 
-            for m in midi_mappings:
-                if m.matches(message):
-                    m.handle(message, midi_out)
+            router.dispatch(message, midi_out)
+            touched_channels.add(channel)
 
+        # refresh LEDs once per batch for each channel that saw input
+        for channel in touched_channels:
             if channel in current_state:
                 current_state[channel].update_loop()
 
-        time.sleep(0.01)
+        if handled < MAX_MESSAGES_PER_TICK:
+            time.sleep(0.01)  # only idle once the input queue is empty
 except KeyboardInterrupt:
     logging.info("🛑 Exiting.")
 finally:
+    hold_scheduler.stop()
     midi_in.close_port()
     midi_out.close_port()
     logging.info("✅ Ports closed.")